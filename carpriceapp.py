@@ -1,135 +1,488 @@
+import glob
+import hashlib
+import http.client
+import inspect
+import io
+import os
+import shutil
+import tempfile
+import time
+import urllib.request
 import streamlit as st
+import numpy as np
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-from scipy.stats import pearsonr
+from matplotlib.ticker import MaxNLocator
+import plotly.express as px
+from scipy.stats import t as t_dist
 
-# Load Data
-@st.cache_data
+# Column types of the cleaned automobile dataset, so read_csv can skip type inference
+# (floats are parsed straight into float32)
+COLUMN_DTYPES = {
+    "symboling": "int64", "normalized-losses": "int64", "make": "object",
+    "aspiration": "object", "num-of-doors": "object", "body-style": "object",
+    "drive-wheels": "object", "engine-location": "object", "wheel-base": "float32",
+    "length": "float32", "width": "float32", "height": "float32",
+    "curb-weight": "int64", "engine-type": "object", "num-of-cylinders": "object",
+    "engine-size": "int64", "fuel-system": "object", "bore": "float32",
+    "stroke": "float32", "compression-ratio": "float32", "horsepower": "float32",
+    "peak-rpm": "float32", "city-mpg": "int64", "highway-mpg": "int64",
+    "price": "float32", "city-L/100km": "float32", "horsepower-binned": "object",
+    "diesel": "int64", "gas": "int64",
+}
+
+DATA_URL = 'https://raw.githubusercontent.com/klamsal/Fall2024Exam/refs/heads/main/CleanedAutomobile.csv'
+LOCAL_CSV = "CleanedAutomobile.csv"
+LOCAL_CSV_MAX_AGE = 24 * 60 * 60  # seconds before the local copy is re-downloaded
+DOWNLOAD_TIMEOUT = 30  # seconds a stalled download may block load_data before giving up
+# load_data re-checks the local copy after this long, so a refreshed CSV reaches
+# the app within a day
+DATA_TTL = LOCAL_CSV_MAX_AGE
+# Bump when downcast() changes what it stores, so existing parquet copies are rebuilt
+PARQUET_FORMAT_VERSION = 1
+# Typed copy of LOCAL_CSV for fast warm starts. The name is tagged with the column
+# types and format version, so a copy written under an older schema is never read.
+PARQUET_TAG = hashlib.sha1(repr((sorted(COLUMN_DTYPES.items()), PARQUET_FORMAT_VERSION)).encode()).hexdigest()[:8]
+LOCAL_PARQUET = f"CleanedAutomobile.{PARQUET_TAG}.parquet"
+
+# Keep a local copy of the CSV so a Streamlit cache miss is a file read, not a download.
+# The download goes to a temp file that replaces the copy only once complete, so a
+# concurrent reader never sees a partial CSV; if it fails (including a dropped or
+# timed-out transfer), the old copy is kept.
+def fetch_csv():
+    if not os.path.exists(LOCAL_CSV) or time.time() - os.path.getmtime(LOCAL_CSV) > LOCAL_CSV_MAX_AGE:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(LOCAL_CSV)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as out, urllib.request.urlopen(DATA_URL, timeout=DOWNLOAD_TIMEOUT) as response:
+                shutil.copyfileobj(response, out)
+            os.chmod(tmp_path, 0o644)  # mkstemp creates the file as 0600
+            os.replace(tmp_path, LOCAL_CSV)
+        except (OSError, http.client.HTTPException):
+            if not os.path.exists(LOCAL_CSV):
+                raise
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    return LOCAL_CSV
+
+# Shrink integer columns to the smallest dtype that holds them and store
+# low-cardinality text columns as categories
+def downcast(df):
+    for c in df.select_dtypes(include=["int64"]).columns:
+        df[c] = pd.to_numeric(df[c], downcast="integer")
+    for c in df.select_dtypes(include=["object"]).columns:
+        if df[c].nunique() / len(df) < 0.5:
+            df[c] = df[c].astype("category")
+    return df
+
+# Load Data (memoized across reruns). Restarts read the parsed and downcast frame
+# from a parquet copy, rebuilt whenever the CSV is newer or the copy can't be read.
+# Returns the frame and a version (the CSV's mtime) that changes whenever the data does.
+@st.cache_data(ttl=DATA_TTL)
 def load_data():
-    path = 'https://raw.githubusercontent.com/klamsal/Fall2024Exam/refs/heads/main/CleanedAutomobile.csv'
-    return pd.read_csv(path)
+    csv_path = fetch_csv()
+    version = os.path.getmtime(csv_path)
+    if os.path.exists(LOCAL_PARQUET) and os.path.getmtime(LOCAL_PARQUET) >= version:
+        try:
+            return pd.read_parquet(LOCAL_PARQUET, engine="pyarrow"), version
+        except (OSError, ValueError):
+            pass  # unreadable copy: re-parse the CSV and rewrite it below
+    df = downcast(pd.read_csv(csv_path, dtype=COLUMN_DTYPES, engine="pyarrow"))
+    # Write to a temp file and swap it in, so a concurrent reader never sees a partial copy
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(LOCAL_PARQUET)), suffix=".tmp")
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_path, engine="pyarrow")
+        os.chmod(tmp_path, 0o644)  # mkstemp creates the file as 0600
+        os.replace(tmp_path, LOCAL_PARQUET)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    # Copies written under an older PARQUET_TAG are never read again
+    for path in glob.glob(os.path.join(os.path.dirname(LOCAL_PARQUET), "CleanedAutomobile.*.parquet")):
+        if os.path.basename(path) != os.path.basename(LOCAL_PARQUET):
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # already removed by a concurrent rebuild
+    # Summaries persisted for the previous copy can never be hit again; drop their files
+    corr_and_pvals.clear()
+    get_describe.clear()
+    return df, version
+
+# The helpers below only ever receive the DataFrame from load_data(), so it is
+# passed as `_df` to stop Streamlit from hashing the whole frame on every rerun.
+# The dataset `version` from load_data() is hashed instead, so a reloaded CSV
+# never hits results cached for an older one; the ttl only evicts those.
+
+# Numeric and categorical column names, computed once per dataset
+@st.cache_data(ttl=DATA_TTL)
+def _split_types(_df, version):
+    numeric, categorical = [], []
+    for c, dtype in _df.dtypes.items():
+        if dtype.kind in "iuf":
+            numeric.append(c)
+        elif dtype.kind == "O" or isinstance(dtype, pd.CategoricalDtype):
+            categorical.append(c)
+    return numeric, categorical
+
+# Pairwise-complete Pearson correlation matrix (same result as DataFrame.corr())
+# built from a handful of matrix products instead of a per-column-pair loop.
+# Also returns the number of rows each correlation was computed over.
+def corr_matrix(X):
+    X = np.asarray(X, dtype="float64")
+    present = np.isfinite(X)
+    M = present.astype("float64")
+    X0 = np.where(present, X, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Center each column so the variance terms below don't lose precision
+        X0 = np.where(present, X0 - X0.sum(axis=0) / M.sum(axis=0), 0.0)
+    n = M.T @ M
+    sx, sy = X0.T @ M, M.T @ X0
+    sxx, syy = (X0 * X0).T @ M, M.T @ (X0 * X0)
+    sxy = X0.T @ X0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sy / n
+        vx, vy = sxx - sx * sx / n, syy - sy * sy / n
+        r = cov / np.sqrt(vx * vy)
+    # A column that is constant over a pair's rows has no correlation (NaN, as in
+    # DataFrame.corr()); its variance is only rounding noise, which must not clip to ±1
+    r[(vx <= 1e-10 * sxx) | (vy <= 1e-10 * syy)] = np.nan
+    r = np.clip(r, -1.0, 1.0)
+    np.fill_diagonal(r, np.where(np.isnan(np.diag(r)), np.nan, 1.0))
+    return r, n
+
+# Two-sided p-values for Pearson correlations r computed over n rows each
+def corr_pvalues(r, n):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.abs(r) * np.sqrt((n - 2) / (1 - r * r))
+        p = 2 * t_dist.sf(t, n - 2)
+    p[n < 3] = np.nan
+    return p
+
+# Results kept on disk outlive code changes, and Streamlit only keys them on the
+# cached function's own source. So they are also keyed on this tag, which covers the
+# parquet schema (column types, downcast) and the correlation code above.
+SUMMARY_TAG = hashlib.sha1(
+    (PARQUET_TAG + inspect.getsource(corr_matrix) + inspect.getsource(corr_pvalues)).encode()
+).hexdigest()[:8]
+# In-memory entries kept per persisted summary. Persisted entries ignore a ttl, and
+# their files are dropped by load_data whenever it rebuilds the parquet copy.
+MAX_PERSISTED_SUMMARIES = 4
+
+# Correlation and p-value matrices of the numeric columns, computed once per dataset
+# version and kept on disk across restarts. The version and tag keys are what keep
+# results for an older CSV or older code from being read back.
+@st.cache_data(persist="disk", max_entries=MAX_PERSISTED_SUMMARIES)
+def corr_and_pvals(_df, version, tag):
+    numeric_columns, _ = _split_types(_df, version)
+    r, n = corr_matrix(_df[numeric_columns])
+    return (
+        pd.DataFrame(r, index=numeric_columns, columns=numeric_columns),
+        pd.DataFrame(corr_pvalues(r, n), index=numeric_columns, columns=numeric_columns),
+    )
+
+def get_corr(df, version):
+    return corr_and_pvals(df, version, SUMMARY_TAG)[0]
+
+# Correlations above this value are shown on the High Correlations page
+HIGH_CORRELATION_THRESHOLD = 0.5
+
+# Pairs of columns correlated above `threshold`, strongest first. Pairs come
+# from the upper triangle, which excludes self-correlations and counts each
+# (A, B) / (B, A) pair once.
+@st.cache_data(ttl=DATA_TTL)
+def high_correlation_pairs(_df, version, threshold):
+    correlation_matrix = get_corr(_df, version)
+    C = correlation_matrix.to_numpy()
+    rows, cols = np.triu_indices(C.shape[0], k=1)
+    keep = C[rows, cols] > threshold
+    rows, cols = rows[keep], cols[keep]
+    pairs = pd.DataFrame({
+        "Variable 1": correlation_matrix.columns[rows],
+        "Variable 2": correlation_matrix.columns[cols],
+        "Correlation": C[rows, cols],
+    })
+    return pairs.sort_values("Correlation", ascending=False, ignore_index=True)
+
+# Columns that take part in at least one of those pairs, in dataset order
+@st.cache_data(ttl=DATA_TTL)
+def high_correlation_columns(_df, version, threshold):
+    pairs = high_correlation_pairs(_df, version, threshold)
+    involved = set(pairs["Variable 1"]) | set(pairs["Variable 2"])
+    return [c for c in get_corr(_df, version).columns if c in involved]
+
+# (min, max) of every numeric column, used to set up the filter slider
+@st.cache_data(ttl=DATA_TTL)
+def column_bounds(_df, version):
+    numeric_columns, _ = _split_types(_df, version)
+    bounds = {}
+    for c in numeric_columns:
+        values = _df[c].to_numpy(dtype="float64")
+        bounds[c] = (float(np.nanmin(values)), float(np.nanmax(values)))
+    return bounds
+
+# Row order that sorts a numeric column, plus the sorted values, so a range
+# filter is two binary searches instead of a full-column mask
+@st.cache_data(ttl=DATA_TTL)
+def sorted_column(_df, version, column):
+    values = _df[column].to_numpy()
+    order = np.argsort(values, kind="stable")
+    return order, values[order]
+
+# Descriptive statistics, computed once per dataset version and schema and kept on disk
+@st.cache_data(persist="disk", max_entries=MAX_PERSISTED_SUMMARIES)
+def get_describe(_df, version, tag):
+    return _df.describe()
+
+# Pearson correlation and two-sided p-value over the rows where both values are finite
+def safe_correlation(x, y):
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    mask = np.isfinite(x) & np.isfinite(y)
+    if not mask.all():
+        x, y = x[mask], y[mask]
+    n = x.size
+    # A constant column has no correlation (NaN, as scipy's pearsonr reports);
+    # rounding noise must not turn it into r = ±1
+    if n < 3 or np.ptp(x) == 0 or np.ptp(y) == 0:
+        return np.nan, np.nan
+    xc, yc = x - x.mean(), y - y.mean()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = float(np.clip((xc @ yc) / np.sqrt((xc @ xc) * (yc @ yc)), -1.0, 1.0))
+        if abs(r) == 1.0:
+            return r, 0.0
+        t = r * np.sqrt((n - 2) / (1 - r * r))
+    return r, float(2 * t_dist.sf(abs(t), n - 2))
+
+# safe_correlation memoized on the column pair and the sidebar filter
+@st.cache_data(ttl=DATA_TTL)
+def cached_correlation(_data, x, y, filter_key):
+    return safe_correlation(_data[x], _data[y])
+
+# Largest number of rows drawn in a single plot; bigger selections are subsampled
+# (statistics such as the Pearson correlation still use every row)
+MAX_PLOT_POINTS = 5000
+
+def plot_sample(data):
+    if len(data) <= MAX_PLOT_POINTS:
+        return data
+    return data.sample(MAX_PLOT_POINTS, random_state=0)
+
+# Plot theme for every figure. The theme sets process-wide matplotlib rcParams, so
+# cache_resource runs it once per server process instead of on every rerun.
+@st.cache_resource
+def init_plot_theme():
+    sns.set_theme(style="whitegrid")
+
+init_plot_theme()
 
 # Custom plot styling function
 def style_plot(fig):
-    sns.set_theme(style="whitegrid")
     fig.patch.set_facecolor('#f5f5f5')
     return fig
 
+# Heatmaps with more columns than this are drawn without per-cell value labels,
+# since every label is a separate matplotlib Text artist
+MAX_ANNOTATED_COLUMNS = 10
+
+# Matplotlib figures are cached as rendered PNG bytes, so a cache hit skips
+# matplotlib entirely, and Plotly figures as Figure objects; the number of
+# cached figures per plot type is bounded
+MAX_CACHED_FIGURES = 32
+
+# Render a styled figure to PNG bytes (the same settings st.pyplot uses) and free it
+def fig_to_png(fig):
+    buf = io.BytesIO()
+    style_plot(fig).savefig(buf, format="png", bbox_inches="tight", dpi=200)
+    plt.close(fig)
+    return buf.getvalue()
+
+# Keep tick construction cheap: a few major ticks on the given numeric axes, no minor ticks
+def limit_ticks(ax, axes="xy"):
+    if "x" in axes:
+        ax.xaxis.set_major_locator(MaxNLocator(6))
+    if "y" in axes:
+        ax.yaxis.set_major_locator(MaxNLocator(6))
+    ax.minorticks_off()
+
+# Cached figure builders. The filtered data is passed as `_data` so Streamlit
+# keys the cache on the selection (dataset version, columns + filter range)
+# instead of hashing it.
+@st.cache_data(ttl=DATA_TTL, max_entries=MAX_CACHED_FIGURES)
+def build_corr_heatmap(_df, version, columns):
+    corr = get_corr(_df, version).loc[list(columns), list(columns)]
+    fig, ax = plt.subplots(figsize=(10, 8))
+    annotate = len(columns) <= MAX_ANNOTATED_COLUMNS
+    # The matrix is symmetric, so only draw (and label) the diagonal and upper triangle
+    lower = np.tril(np.ones(corr.shape, dtype=bool), k=-1)
+    sns.heatmap(corr, mask=lower, vmin=-1, vmax=1, annot=annotate, fmt=".2f", cmap="coolwarm", ax=ax)
+    return fig_to_png(fig)
+
+# Scatterplot is drawn with WebGL so large selections stay interactive in the browser
+@st.cache_resource(ttl=DATA_TTL, max_entries=MAX_CACHED_FIGURES)
+def build_scatter(_data, x, y, filter_key):
+    return px.scatter(plot_sample(_data), x=x, y=y, render_mode="webgl", template="plotly_white")
+
+# Pairplot as a Plotly scatter matrix (a single WebGL splom trace)
+@st.cache_resource(ttl=DATA_TTL, max_entries=MAX_CACHED_FIGURES)
+def build_pairplot(_data, columns, filter_key):
+    fig = px.scatter_matrix(plot_sample(_data), dimensions=list(columns), template="plotly_white")
+    fig.update_traces(diagonal_visible=False)
+    return fig
+
+@st.cache_data(ttl=DATA_TTL, max_entries=MAX_CACHED_FIGURES)
+def build_lineplot(_data, x, y, filter_key):
+    stride = max(1, len(_data) // MAX_PLOT_POINTS)
+    fig, ax = plt.subplots()
+    sns.lineplot(data=_data.iloc[::stride], x=x, y=y, ax=ax)
+    limit_ticks(ax)
+    return fig_to_png(fig)
+
+@st.cache_data(ttl=DATA_TTL, max_entries=MAX_CACHED_FIGURES)
+def build_boxplot(_data, x, y, filter_key):
+    # Downcast category columns keep every level after filtering; drop the unused
+    # ones so they don't show up as empty slots on the x-axis
+    if isinstance(_data[x].dtype, pd.CategoricalDtype):
+        _data = _data.assign(**{x: _data[x].cat.remove_unused_categories()})
+    fig, ax = plt.subplots()
+    sns.boxplot(data=_data, x=x, y=y, ax=ax)
+    limit_ticks(ax, axes="y")
+    return fig_to_png(fig)
+
+# Visualization sections. Each is a fragment, so changing one of its widgets
+# reruns just that section with the same filtered data, not the whole script.
+
+# X/Y axis pickers shared by the two-variable plots, side by side
+def pick_xy(columns):
+    col1, col2 = st.columns(2)
+    return (
+        col1.selectbox("Select X-axis variable:", columns),
+        col2.selectbox("Select Y-axis variable:", columns),
+    )
+
+# Scatterplot
+@st.fragment
+def scatterplot_section(filtered_data, filter_key):
+    st.write("### Scatterplot with P-Value")
+    scatter_x, scatter_y = pick_xy(numeric_columns)
+    if scatter_x and scatter_y:
+        if len(filtered_data) == len(df):
+            # No rows filtered out: look the pair up in the precomputed matrices
+            corr, pvals = corr_and_pvals(df, data_version, SUMMARY_TAG)
+            correlation, p_value = corr.at[scatter_x, scatter_y], pvals.at[scatter_x, scatter_y]
+        else:
+            correlation, p_value = cached_correlation(filtered_data, scatter_x, scatter_y, filter_key)
+        st.write(f"**Pearson Correlation**: {correlation:.2f}  \n**P-value**: {p_value:.2e}")
+        st.plotly_chart(build_scatter(filtered_data, scatter_x, scatter_y, filter_key), width="stretch")
+
+# Line Plot
+@st.fragment
+def lineplot_section(filtered_data, filter_key):
+    st.write("### Line Plot")
+    line_x, line_y = pick_xy(numeric_columns)
+    if line_x and line_y:
+        st.image(build_lineplot(filtered_data, line_x, line_y, filter_key), width="stretch")
+
+# Boxplot
+@st.fragment
+def boxplot_section(filtered_data, filter_key):
+    st.write("### Boxplot")
+    box_x = st.selectbox("Select categorical variable (X-axis):", categorical_columns)
+    box_y = st.selectbox("Select numeric variable (Y-axis):", numeric_columns)
+    if box_x and box_y:
+        st.image(build_boxplot(filtered_data, box_x, box_y, filter_key), width="stretch")
+
+# Pairplot
+@st.fragment
+def pairplot_section(filtered_data, filter_key):
+    st.write("### Pairplot")
+    selected_vars = st.multiselect("Select variables for Pairplot:", numeric_columns, default=numeric_columns[:3])
+    if selected_vars:
+        # Dataset column order, so the same set of variables always hits the same cache entry
+        pair_columns = tuple(c for c in numeric_columns if c in selected_vars)
+        st.plotly_chart(build_pairplot(filtered_data, pair_columns, filter_key), width="stretch")
+
+VISUALIZATION_SECTIONS = {
+    "Scatterplot": scatterplot_section,
+    "Line Plot": lineplot_section,
+    "Boxplot": boxplot_section,
+    "Pairplot": pairplot_section,
+}
+
 # Sidebar navigation
 st.sidebar.title("Navigation")
 options = st.sidebar.radio("Go to", ["Home", "Data Overview", "Visualizations", "High Correlations"])
 
-# Load the data
-df = load_data()
-
-# Numeric and categorical columns
-numeric_df = df.select_dtypes(include=["float64", "int"])
-categorical_columns = df.select_dtypes(include=["object"]).columns
-
 # Title and Home
 if options == "Home":
     st.title("Data Analysis Dashboard")
     st.write("Welcome to the Data Analysis Dashboard! Use the sidebar to explore the dataset and visualize relationships.")
+    # Home doesn't use the dataset, so don't load it on the landing page
+    st.stop()
+
+# Load the data
+df, data_version = load_data()
+
+# Numeric and categorical columns
+numeric_columns, categorical_columns = _split_types(df, data_version)
 
 # Data Overview
 if options == "Data Overview":
     st.header("Data Overview")
     st.write("### Dataset Preview")
-    st.write(df.head())
+    st.dataframe(df.head(), hide_index=True, width="stretch")
     st.write("### Descriptive Statistics")
-    st.write(df.describe())
+    st.dataframe(get_describe(df, data_version, PARQUET_TAG), width="stretch")
 
 # Visualizations
 if options == "Visualizations":
     st.sidebar.subheader("Visualization Options")
     vis_type = st.sidebar.radio(
         "Select Visualization Type:",
-        ["Scatterplot", "Line Plot", "Boxplot", "Pairplot"]
+        list(VISUALIZATION_SECTIONS)
     )
 
     # Add slider to filter data by a numeric column
     st.sidebar.subheader("Data Filtering")
-    selected_column = st.sidebar.selectbox("Select column to filter:", numeric_df.columns)
-    min_val, max_val = numeric_df[selected_column].min(), numeric_df[selected_column].max()
-    range_filter = st.sidebar.slider(f"Filter by {selected_column} range:", float(min_val), float(max_val), (float(min_val), float(max_val)))
+    selected_column = st.sidebar.selectbox("Select column to filter:", numeric_columns)
+    min_val, max_val = column_bounds(df, data_version)[selected_column]
+    range_filter = st.sidebar.slider(f"Filter by {selected_column} range:", min_val, max_val, (min_val, max_val))
 
     # Filter the dataset based on the slider range
-    filtered_data = df[(df[selected_column] >= range_filter[0]) & (df[selected_column] <= range_filter[1])]
-
-    # Scatterplot
-    if vis_type == "Scatterplot":
-        st.write("### Scatterplot with P-Value")
-        scatter_x = st.selectbox("Select X-axis variable:", numeric_df.columns)
-        scatter_y = st.selectbox("Select Y-axis variable:", numeric_df.columns)
-        if scatter_x and scatter_y:
-            fig, ax = plt.subplots()
-            sns.scatterplot(data=filtered_data, x=scatter_x, y=scatter_y, ax=ax)
-            correlation, p_value = pearsonr(filtered_data[scatter_x], filtered_data[scatter_y])
-            st.write(f"**Pearson Correlation**: {correlation:.2f}")
-            st.write(f"**P-value**: {p_value:.2e}")
-            st.pyplot(style_plot(fig))
-
-    # Line Plot
-    elif vis_type == "Line Plot":
-        st.write("### Line Plot")
-        line_x = st.selectbox("Select X-axis variable:", numeric_df.columns)
-        line_y = st.selectbox("Select Y-axis variable:", numeric_df.columns)
-        if line_x and line_y:
-            fig, ax = plt.subplots()
-            sns.lineplot(data=filtered_data, x=line_x, y=line_y, ax=ax)
-            st.pyplot(style_plot(fig))
-
-    # Boxplot
-    elif vis_type == "Boxplot":
-        st.write("### Boxplot")
-        box_x = st.selectbox("Select categorical variable (X-axis):", categorical_columns)
-        box_y = st.selectbox("Select numeric variable (Y-axis):", numeric_df.columns)
-        if box_x and box_y:
-            fig, ax = plt.subplots()
-            sns.boxplot(data=filtered_data, x=box_x, y=box_y, ax=ax)
-            st.pyplot(style_plot(fig))
-
-    # Pairplot
-    elif vis_type == "Pairplot":
-        st.write("### Pairplot")
-        selected_vars = st.multiselect("Select variables for Pairplot:", numeric_df.columns, default=numeric_df.columns[:3])
-        if selected_vars:
-            fig = sns.pairplot(data=filtered_data, vars=selected_vars)
-            st.pyplot(style_plot(fig.fig))
+    order, sorted_values = sorted_column(df, data_version, selected_column)
+    bounds = np.asarray(range_filter)
+    if sorted_values.dtype.kind == "f":
+        # Compare in the column's own precision, as `df[col] >= lo` does; a float64
+        # bound would drop float32 values equal to a slider endpoint
+        bounds = bounds.astype(sorted_values.dtype)
+    lo = np.searchsorted(sorted_values, bounds[0], side="left")
+    hi = np.searchsorted(sorted_values, bounds[1], side="right")
+    filtered_data = df.iloc[order[lo:hi]]
+    filter_key = (data_version, selected_column, range_filter)
+
+    # Only the chosen plot's section reruns when its own widgets change
+    VISUALIZATION_SECTIONS[vis_type](filtered_data, filter_key)
 
 # Heatmap for Columns with Correlation > 0.5
 if options == "High Correlations":
     st.header("Highly Correlated Variables")
-    st.write("### Heatmap for Correlations > 0.5")
-    
-    # Calculate correlations for numeric columns
-    correlation_matrix = numeric_df.corr()
-    
-    # Get pairs of correlations greater than 0.5, excluding self-correlations
-    high_correlations = (
-        correlation_matrix.stack()
-        .reset_index()
-        .rename(columns={0: "Correlation", "level_0": "Variable 1", "level_1": "Variable 2"})
-    )
-    high_correlations = high_correlations[
-        (high_correlations["Variable 1"] != high_correlations["Variable 2"]) & (high_correlations["Correlation"] > 0.5)
-    ]
-
-    # Drop duplicate pairs (e.g., (A, B) and (B, A))
-    high_correlations = high_correlations.drop_duplicates(subset=["Correlation"])
+    st.write(f"### Heatmap for Correlations > {HIGH_CORRELATION_THRESHOLD}")
 
     # Identify columns involved in high correlations
-    correlated_columns = list(set(high_correlations["Variable 1"]).union(set(high_correlations["Variable 2"])))
+    correlated_columns = high_correlation_columns(df, data_version, HIGH_CORRELATION_THRESHOLD)
 
-    # Filter correlation matrix for these columns
+    # Heatmap of the correlation matrix restricted to these columns
     if correlated_columns:
-        filtered_corr_matrix = correlation_matrix.loc[correlated_columns, correlated_columns]
-
         # Display the heatmap
         st.write("### Heatmap of Highly Correlated Variables")
-        fig, ax = plt.subplots(figsize=(10, 8))
-        sns.heatmap(filtered_corr_matrix, annot=True, fmt=".2f", cmap="coolwarm", ax=ax)
-        st.pyplot(style_plot(fig))
+        st.image(build_corr_heatmap(df, data_version, tuple(correlated_columns)), width="stretch")
+        # Large heatmaps are drawn without cell labels, so list the values separately
+        if len(correlated_columns) > MAX_ANNOTATED_COLUMNS:
+            st.dataframe(get_corr(df, data_version).loc[correlated_columns, correlated_columns].round(2), width="stretch")
+
+        st.write("### Highly Correlated Pairs")
+        st.dataframe(high_correlation_pairs(df, data_version, HIGH_CORRELATION_THRESHOLD).round(2), hide_index=True, width="stretch")
     else:
-        st.write("No correlations greater than 0.5 found.")
+        st.write(f"No correlations greater than {HIGH_CORRELATION_THRESHOLD} found.")